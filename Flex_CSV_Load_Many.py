@@ -1,6 +1,5 @@
 from opentrons import protocol_api
-from dataclasses import dataclass
-from typing import List, Set, Union
+from typing import List
 
 
 metadata = {
@@ -1,6 +1,7 @@
+import sys
 from opentrons import protocol_api
 from dataclasses import dataclass
-from typing import List, Set, Union
+from typing import Dict, List, Tuple, Union
 
 
 metadata = {
@@ -87,23 +88,11 @@ def add_parameters(parameters):
     )
 
 
-def validate_data_rows(data_rows):
-    """Process each row of data. Fail fast on the first row missing fields or that has empty fields"""
-    for index, row in enumerate(data_rows, start=1):
-        if len(row) != len(HEADERS):
-            error = f"There are missing fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
-            raise ValueError(error)
-
-        for value in row:
-            if value is None or value.strip() == "":
-                error = f"There are empty fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
-                raise ValueError(error)
-
-
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Transfer:
     """This class describes 1 row of CSV data.
     Using a dataclass allows us to use named attributes to access the data.
+    A row never changes once it is read, so the dataclass is frozen.
     """
 
     source_labware: str
@@ -116,67 +105,57 @@ class Transfer:
     volume_ul: float
 
 
-@dataclass(frozen=True)
-class LabwareSlot:
-    """This class defines labware slots so that we can use python's set."
-    This makes it easier to ensure we only load each labware once."""
-
-    labware: str
-    slot: str
-
-    def __hash__(self):
-        return hash((self.labware, self.slot))
-
-    def __eq__(self, other):
-        if not isinstance(other, LabwareSlot):
-            return NotImplemented
-        return (self.labware, self.slot) == (other.labware, other.slot)
-
-
 def read_transfers_from_list(
     data: List[List[Union[str, int, float]]],
-) -> List[Transfer]:
-    """This function reads a list of lists and returns a list of Transfer objects"""
+) -> Tuple[List[Transfer], Dict[Tuple[str, str], None]]:
+    """This function reads a list of lists and returns a list of Transfer objects
+    and the unique (labware, slot) tuples they reference.
+    Collecting the labware slots while we build the transfers means we only walk the rows once.
+    The slots are the keys of a dict, which ensures we only load each labware once
+    and keeps them in the order they first appear in the CSV."""
 
     # the first row of our data is the headers
     headers = data[0]
     assert headers == HEADERS, f"Expected headers: {HEADERS}, but got: {headers}"
-    # ignore the first row, as it is the headers
-    data_rows = data[1:]
-    validate_data_rows(data_rows)
-    # Iterate over the rest of the rows and create Transfer objects
+    # Iterate over the rest of the rows, validate them and create Transfer objects in the same pass
     # We will iterate over to take action in the protocol.
     transfers = []
+    unique_labware_slots = {}
+    header_count = len(HEADERS)
+
+    # ignore the first row, as it is the headers
+    for index, row in enumerate(data[1:], start=1):
+        # Fail fast on the first row missing fields or that has empty fields
+        if len(row) != header_count:
+            error = f"There are missing fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
+            raise ValueError(error)
+
+        if any(not value or value.isspace() for value in row):
+            error = f"There are empty fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
+            raise ValueError(error)
 
-    for row in data[1:]:
         # CSV data is inherently ordered so we can use the index to access the correct value
         # Processing the row data into a Transfer object allows us to use named attributes to access the data
+        # Labware names and slots repeat across rows, interning them lets every row share one string
+        # so the (labware, slot) lookups below hash and compare the same object
         transfer = Transfer(
-            source_labware=str(row[0]),
-            source_slot=str(row[1]),
+            source_labware=sys.intern(str(row[0])),
+            source_slot=sys.intern(str(row[1])),
             source_well=str(row[2]),
             source_height_above_bottom_mm=float(row[3]),
-            destination_labware=str(row[4]),
-            destination_slot=str(row[5]),
+            destination_labware=sys.intern(str(row[4])),
+            destination_slot=sys.intern(str(row[5])),
             destination_well=str(row[6]),
             volume_ul=float(row[7]),
         )
         transfers.append(transfer)
-    return transfers
-
-
-def get_unique_labware_slots(transfers: List[Transfer]) -> Set[LabwareSlot]:
-    """This function takes a list of Transfer objects and returns a set of unique LabwareSlot objects.
-    The purpose of this function is to ensure that we only load each labware once."""
-    unique_labware_slots = set()
-    for transfer in transfers:
-        unique_labware_slots.add(
-            LabwareSlot(transfer.source_labware, transfer.source_slot)
+        unique_labware_slots.setdefault(
+            (transfer.source_labware, transfer.source_slot), None
         )
-        unique_labware_slots.add(
-            LabwareSlot(transfer.destination_labware, transfer.destination_slot)
+        unique_labware_slots.setdefault(
+            (transfer.destination_labware, transfer.destination_slot), None
         )
-    return unique_labware_slots
+    return transfers, unique_labware_slots
 
 
 FLEX_DECK_SLOTS = [
@@ -197,36 +176,53 @@ FLEX_DECK_SLOTS = [
 
 def run(ctx: protocol_api.ProtocolContext):
     # Get the values from the RTPs
-    pipette_type = ctx.params.pipette_and_tips.split(",")[0]
-    tip_type = ctx.params.pipette_and_tips.split(",")[1]
+    pipette_type, tip_type = ctx.params.pipette_and_tips.split(",", 1)
     pipette_mount = ctx.params.pipette_mount
     tip_reuse = ctx.params.tip_reuse
-    cherrypicking_sequence = ctx.params.cherrypicking_sequence.parse_as_csv()
+    cherrypicking_sequence = ctx.params.cherrypicking_sequence.parse_as_csv(
+        detect_dialect=False, delimiter=","
+    )
 
     # load trash
     trash = ctx.load_trash_bin(TRASH_LOCATION)
 
     # read the transfer information from the csv
-    transfers = read_transfers_from_list(cherrypicking_sequence)
+    transfers, unique_labware_slots = read_transfers_from_list(cherrypicking_sequence)
 
     # load labware
-    unique_labware_slots = get_unique_labware_slots(transfers)
-    for labware_slot in unique_labware_slots:
-        ctx.load_labware(labware_slot.labware, labware_slot.slot)
-
-    # load tipracks
-    tipracks = []
+    wells_by_slot = {}
+    # the deck's slot names, which may be spelled differently in the csv
+    used_slots = {TRASH_LOCATION}
+    for labware, slot in unique_labware_slots:
+        loaded_labware = ctx.load_labware(labware, slot)
+        wells_by_slot[slot] = loaded_labware.wells_by_name()
+        used_slots.add(loaded_labware.parent)
+
+    # find the source and destination wells for each transfer
+    volumes = [transfer.volume_ul for transfer in transfers]
+    sources = [
+        wells_by_slot[transfer.source_slot][transfer.source_well].bottom(
+            transfer.source_height_above_bottom_mm
+        )
+        for transfer in transfers
+    ]
+    destinations = [
+        wells_by_slot[transfer.destination_slot][transfer.destination_well]
+        for transfer in transfers
+    ]
 
     # load tipracks in all slots that are not in use
-    for slot in FLEX_DECK_SLOTS:
-        if not ctx.deck[slot] and slot != TRASH_LOCATION:
-            tipracks.append(ctx.load_labware(tip_type, slot))
+    tipracks = [
+        ctx.load_labware(tip_type, slot)
+        for slot in FLEX_DECK_SLOTS
+        if slot not in used_slots
+    ]
 
     # load pipette
     pipette = ctx.load_instrument(pipette_type, pipette_mount, tip_racks=tipracks)
 
     tip_count = 0
-    tip_max = len(tipracks * 96)
+    tip_max = len(tipracks) * 96
 
     def pick_up():
         nonlocal tip_count
@@ -237,24 +233,17 @@ def run(ctx: protocol_api.ProtocolContext):
         pipette.pick_up_tip()
         tip_count += 1
 
-    if tip_reuse == "never":
-        pick_up()
+    transfer_liquid = pipette.transfer
+    drop_tip = pipette.drop_tip
 
-    for transfer in transfers:
-        source = (
-            ctx.deck[transfer.source_slot]
-            .wells_by_name()[transfer.source_well]
-            .bottom(transfer.source_height_above_bottom_mm)
-        )
-        destination = ctx.deck[transfer.destination_slot].wells_by_name()[
-            transfer.destination_well
-        ]
-        if tip_reuse == "always":
+    if tip_reuse == "always":
+        for volume, source, destination in zip(volumes, sources, destinations):
             pick_up()
-        pipette.transfer(
-            float(transfer.volume_ul), source, destination, new_tip="never"
-        )
-        if tip_reuse == "always":
-            pipette.drop_tip()
+            transfer_liquid(volume, source, destination, new_tip="never")
+            drop_tip()
+    elif transfers:
+        # one tip for the whole run, so do every transfer in a single call
+        pick_up()
+        transfer_liquid(volumes, sources, destinations, new_tip="never")
     if pipette.has_tip:
         pipette.drop_tip()
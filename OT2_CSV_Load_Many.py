@@ -1,6 +1,5 @@
 from opentrons import protocol_api
-from dataclasses import dataclass
-from typing import List, Set, Union
+from typing import List
 
 
 metadata = {
@@ -50,5 +49,5 @@ def evaluate_list_of_lists(
 
 def run(ctx: protocol_api.ProtocolContext):
     # Get the values from the RTPs
-    one_row_csv = ctx.params.csv.parse_as_csv()
+    one_row_csv = ctx.params.csv.parse_as_csv(detect_dialect=False, delimiter=",")
     evaluate_list_of_lists(one_row_csv, ctx)
@@ -1,8 +1,6 @@
-import csv
-from io import StringIO
 from opentrons import protocol_api
 from dataclasses import dataclass
-from typing import List, Set, Union
+from typing import Dict, List, Sequence, Set, Tuple
 import pprint
 
 metadata = {
@@ -14,12 +12,26 @@ requirements = {
     "apiLevel": "2.20",
 }
 
-
-@dataclass
+# The headers the liquids CSV must have.
+# note these match the properties of LiquidDestination
+EXPECTED_HEADERS = frozenset(
+    {
+        "labware_load_name",
+        "slot",
+        "wells",
+        "name",
+        "description",
+        "display_color",
+        "volume",
+    }
+)
+
+
+@dataclass(slots=True, frozen=True)
 class LiquidDestination:
     labware_load_name: str
     slot: str
-    wells: Set[str]
+    wells: Tuple[str, ...]
     name: str
     description: str
     display_color: str
@@ -36,22 +48,20 @@ class LiquidDestinations:
     def __init__(self, ctx) -> None:
         self.ctx = ctx
         self.destinations: List[LiquidDestination] = []
+        # the wells already defined in each labware, keyed by LiquidDestination.key
+        self.wells_by_key: Dict[str, Set[str]] = {}
 
     def add_destination(self, destination: LiquidDestination) -> None:
 
-        # has this destination already been added?
-        liquids_in_same_slot = [
-            d for d in self.destinations if d.key == destination.key
-        ]
-
         # Check for overlapping wells with previously added destinations
-        if liquids_in_same_slot:
-            for liquid in liquids_in_same_slot:
-                overlapping_wells = liquid.wells.intersection(destination.wells)
-                if overlapping_wells:
-                    raise ValueError(
-                        f"Wells {overlapping_wells} in labware {destination.labware_load_name} at slot {destination.slot} have already been defined."
-                    )
+        # in the same labware, without scanning every destination added so far
+        defined_wells = self.wells_by_key.setdefault(destination.key, set())
+        overlapping_wells = defined_wells.intersection(destination.wells)
+        if overlapping_wells:
+            raise ValueError(
+                f"Wells {overlapping_wells} in labware {destination.labware_load_name} at slot {destination.slot} have already been defined."
+            )
+        defined_wells.update(destination.wells)
         # Add the destination
         self.destinations.append(destination)
 
@@ -59,9 +69,10 @@ class LiquidDestinations:
         return self.destinations
 
     def parse_list_of_lists(
-        self, data: List[List[str]], well_delimiter: str = ";"
+        self, data: Sequence[Sequence[str]], well_delimiter: str = ";"
     ) -> None:
-        if not data or not isinstance(data, list) or len(data) < 2:
+        # parse_as_csv always gives us a list, so the row count is the only check needed
+        if len(data) < 2:
             data_error = (
                 "Data must be a non-empty list of lists with at least two rows."
             )
@@ -69,20 +80,11 @@ class LiquidDestinations:
             raise ValueError(data_error)
 
         headers = data[0]
-        # note these match the properties of this class
-        expected_headers = {
-            "labware_load_name",
-            "slot",
-            "wells",
-            "name",
-            "description",
-            "display_color",
-            "volume",
-        }
+        headers_set = set(headers)
 
         # Validate that all expected headers are present
-        unexpected_headers = set(headers) - expected_headers
-        missing_headers = expected_headers - set(headers)
+        unexpected_headers = headers_set - EXPECTED_HEADERS
+        missing_headers = EXPECTED_HEADERS - headers_set
         if unexpected_headers or missing_headers:
             error_message = ""
             if unexpected_headers:
@@ -98,60 +100,54 @@ class LiquidDestinations:
         # Fail fast on the first row missing fields or that has empty fields
         CHECK_MISSING_FIELDS = True  # less values than expected
         CHECK_EMPTY_FIELDS = True  # None or empty string
+        header_count = len(EXPECTED_HEADERS)
+        # The headers are validated, so find the column of each one once
+        # and read the rows by position rather than building a dict for every row
+        column_index = {header: headers.index(header) for header in EXPECTED_HEADERS}
         for index, row in enumerate(data[1:], start=1):
             if CHECK_MISSING_FIELDS:
-                if len(row) != len(expected_headers):
+                if len(row) != header_count:
                     error = f"There are missing fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
                     self.ctx.comment(error)
                     raise ValueError(error)
 
             if CHECK_EMPTY_FIELDS:
-                for value in row:
-                    if value is None or value.strip() == "":
-                        error = f"There are empty fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
-                        self.ctx.comment(error)
-                        raise ValueError(error)
-
-            # Create a dictionary for the row using zip
-            row_dict = dict(zip(headers, row))
-            wells = set(row_dict["wells"].split(well_delimiter))
+                if any(not value or value.isspace() for value in row):
+                    error = f"There are empty fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
+                    self.ctx.comment(error)
+                    raise ValueError(error)
+
+            # a tuple is enough as we only iterate the wells, the overlap index lives in LiquidDestinations
+            # dict.fromkeys drops repeated wells and keeps the order they are listed in
+            wells = tuple(
+                dict.fromkeys(row[column_index["wells"]].split(well_delimiter))
+            )
             try:
-                volume = float(row_dict["volume"])
+                volume = float(row[column_index["volume"]])
             except ValueError:
+                row_dict = dict(zip(headers, row))
                 error = f"Invalid volume value: {row_dict['volume']} in row: {row_dict}"
                 self.ctx.comment(error)
                 raise ValueError(error)
 
             destination = LiquidDestination(
-                labware_load_name=row_dict["labware_load_name"],
-                slot=row_dict["slot"],
+                labware_load_name=row[column_index["labware_load_name"]],
+                slot=row[column_index["slot"]],
                 wells=wells,
-                name=row_dict["name"],
-                description=row_dict["description"],
-                display_color=row_dict["display_color"],
+                name=row[column_index["name"]],
+                description=row[column_index["description"]],
+                display_color=row[column_index["display_color"]],
                 volume=volume,
             )
             self.add_destination(destination)
 
 
-@dataclass(frozen=True)
-class LabwareSlot:
-    labware: str
-    slot: str
-
-    def __hash__(self):
-        return hash((self.labware, self.slot))
-
-    def __eq__(self, other):
-        if not isinstance(other, LabwareSlot):
-            return NotImplemented
-        return (self.labware, self.slot) == (other.labware, other.slot)
-
-
-def get_unique_labware_slots(liquids: List[LiquidDestination]) -> Set[LabwareSlot]:
+def get_unique_labware_slots(
+    liquids: List[LiquidDestination],
+) -> Set[Tuple[str, str]]:
     unique_labware_slots = set()
     for liquid in liquids:
-        unique_labware_slots.add(LabwareSlot(liquid.labware_load_name, liquid.slot))
+        unique_labware_slots.add((liquid.labware_load_name, liquid.slot))
     return unique_labware_slots
 
 
@@ -161,25 +157,43 @@ def add_parameters(parameters):
         display_name="liquid definitions",
         description="Table of liquids",
     )
+    parameters.add_bool(
+        display_name="Verbose",
+        variable_name="verbose",
+        default=False,
+        description="Comment the parsed CSV data into the run log.",
+    )
 
 
 def run(ctx: protocol_api.ProtocolContext):
 
     # Get the values from the RTPs
     liquids = ctx.params.liquids.parse_as_csv()
-    ctx.comment(pprint.pformat(liquids))
+    # pretty printing the whole CSV is only worth the time when debugging
+    if ctx.params.verbose:
+        ctx.comment(pprint.pformat(liquids))
     liquid_destinations = LiquidDestinations(ctx)
     liquid_destinations.parse_list_of_lists(liquids)
     labwares = get_unique_labware_slots(liquid_destinations.get_destinations())
-    for labware in labwares:
-        ctx.load_labware(labware.labware, labware.slot)
+    wells_by_slot = {}
+    for labware, slot in labwares:
+        wells_by_slot[slot] = ctx.load_labware(labware, slot).wells_by_name()
+    # define each distinct liquid once, even when the CSV places it in several labware
+    liquid_cache = {}
     for destination in liquid_destinations.get_destinations():
-        liquid = ctx.define_liquid(
-            name=destination.name,
-            description=destination.description,
-            display_color=destination.display_color,
+        liquid_key = (
+            destination.name,
+            destination.description,
+            destination.display_color,
         )
-        for well in destination.wells:
-            ctx.deck[destination.slot].wells_by_name()[well].load_liquid(
-                liquid=liquid, volume=destination.volume
+        liquid = liquid_cache.get(liquid_key)
+        if liquid is None:
+            liquid = ctx.define_liquid(
+                name=destination.name,
+                description=destination.description,
+                display_color=destination.display_color,
             )
+            liquid_cache[liquid_key] = liquid
+        wells = wells_by_slot[destination.slot]
+        for well in destination.wells:
+            wells[well].load_liquid(liquid=liquid, volume=destination.volume)
@@ -1,6 +1,6 @@
 import pandas as pd
 from opentrons import protocol_api
-from typing import List, Set
+from typing import Dict, Sequence, Set, Tuple
 import pprint
 
 metadata = {
@@ -12,6 +12,19 @@ requirements = {
     "apiLevel": "2.20",
 }
 
+# The headers the liquids CSV must have.
+EXPECTED_HEADERS = frozenset(
+    {
+        "labware_load_name",
+        "slot",
+        "wells",
+        "name",
+        "description",
+        "display_color",
+        "volume",
+    }
+)
+
 
 class LiquidDestinations:
     ctx: protocol_api.ProtocolContext
@@ -19,27 +32,24 @@ class LiquidDestinations:
     def __init__(self, ctx) -> None:
         self.ctx = ctx
         self.destinations = pd.DataFrame()
+        # the wells already defined in each labware, keyed by (labware_load_name, slot)
+        self.wells_by_key: Dict[Tuple[str, str], Set[str]] = {}
 
     def add_destination(self, destination: pd.DataFrame) -> None:
         # Check for overlapping wells with previously added destinations
-        for _, row in destination.iterrows():
-            if not self.destinations.empty:
-                overlapping = self.destinations[
-                    (self.destinations["labware_load_name"] == row["labware_load_name"])
-                    & (self.destinations["slot"] == row["slot"])
-                    & (
-                        self.destinations["wells"].apply(
-                            lambda wells: any(well in wells for well in row["wells"])
-                        )
-                    )
-                ]
-                if not overlapping.empty:
-                    overlapping_wells = set(row["wells"]).intersection(
-                        *overlapping["wells"].tolist()
-                    )
-                    raise ValueError(
-                        f"Wells {overlapping_wells} in labware {row['labware_load_name']} at slot {row['slot']} have already been defined."
-                    )
+        # zip over the columns instead of iterrows() so we don't build a Series per row
+        for labware_load_name, slot, wells in zip(
+            destination["labware_load_name"], destination["slot"], destination["wells"]
+        ):
+            defined_wells = self.wells_by_key.setdefault(
+                (labware_load_name, slot), set()
+            )
+            overlapping_wells = defined_wells.intersection(wells)
+            if overlapping_wells:
+                raise ValueError(
+                    f"Wells {overlapping_wells} in labware {labware_load_name} at slot {slot} have already been defined."
+                )
+            defined_wells.update(wells)
         self.destinations = pd.concat(
             [self.destinations, destination], ignore_index=True
         )
@@ -48,9 +58,10 @@ class LiquidDestinations:
         return self.destinations
 
     def parse_list_of_lists(
-        self, data: List[List[str]], well_delimiter: str = ";"
+        self, data: Sequence[Sequence[str]], well_delimiter: str = ";"
     ) -> None:
-        if not data or not isinstance(data, list) or len(data) < 2:
+        # parse_as_csv always gives us a list, so the row count is the only check needed
+        if len(data) < 2:
             data_error = (
                 "Data must be a non-empty list of lists with at least two rows."
             )
@@ -59,22 +70,12 @@ class LiquidDestinations:
 
         # Convert the list of lists into a DataFrame
         headers = data[0]
-
-        # Expected headers
-        expected_headers = {
-            "labware_load_name",
-            "slot",
-            "wells",
-            "name",
-            "description",
-            "display_color",
-            "volume",
-        }
+        headers_set = set(headers)
 
         # Validate headers
-        if not set(headers).issuperset(expected_headers):
-            missing_headers = expected_headers - set(headers)
-            unexpected_headers = set(headers) - expected_headers
+        if not headers_set.issuperset(EXPECTED_HEADERS):
+            missing_headers = EXPECTED_HEADERS - headers_set
+            unexpected_headers = headers_set - EXPECTED_HEADERS
             error_message = ""
             if missing_headers:
                 error_message += f"Missing headers: {', '.join(missing_headers)}. "
@@ -97,7 +98,7 @@ class LiquidDestinations:
         df["wells"] = df["wells"].apply(lambda x: set(x.split(well_delimiter)))
 
         # Check for empty fields
-        if df.isnull().values.any() or (df.applymap(lambda x: x == "").any().any()):
+        if df.isnull().values.any() or (df == "").values.any():
             error = "There are empty fields in the data."
             self.ctx.comment(error)
             raise ValueError(error)
@@ -106,9 +107,9 @@ class LiquidDestinations:
         self.add_destination(df)
 
 
-def get_unique_labware_slots(destinations: pd.DataFrame) -> Set[str]:
+def get_unique_labware_slots(destinations: pd.DataFrame) -> Set[Tuple[str, str]]:
     unique_labware_slots = set(
-        destinations[["labware_load_name", "slot"]].apply(tuple, axis=1)
+        zip(destinations["labware_load_name"], destinations["slot"])
     )
     return unique_labware_slots
 
@@ -119,25 +120,43 @@ def add_parameters(parameters):
         display_name="liquid definitions",
         description="Table of liquids",
     )
+    parameters.add_bool(
+        display_name="Verbose",
+        variable_name="verbose",
+        default=False,
+        description="Comment the parsed CSV data into the run log.",
+    )
 
 
 def run(ctx: protocol_api.ProtocolContext):
 
     # Get the values from the RTPs
     liquids = ctx.params.liquids.parse_as_csv()
-    ctx.comment(pprint.pformat(liquids))
+    # pretty printing the whole CSV is only worth the time when debugging
+    if ctx.params.verbose:
+        ctx.comment(pprint.pformat(liquids))
     liquid_destinations = LiquidDestinations(ctx)
     liquid_destinations.parse_list_of_lists(liquids)
     labwares = get_unique_labware_slots(liquid_destinations.get_destinations())
-    for labware in labwares:
-        ctx.load_labware(labware[0], labware[1])
-    for _, destination in liquid_destinations.get_destinations().iterrows():
-        liquid = ctx.define_liquid(
-            name=destination["name"],
-            description=destination["description"],
-            display_color=destination["display_color"],
+    wells_by_slot = {}
+    for labware, slot in labwares:
+        wells_by_slot[slot] = ctx.load_labware(labware, slot).wells_by_name()
+    # define each distinct liquid once, even when the CSV places it in several labware
+    liquid_cache = {}
+    for destination in liquid_destinations.get_destinations().itertuples(index=False):
+        liquid_key = (
+            destination.name,
+            destination.description,
+            destination.display_color,
         )
-        for well in destination["wells"]:
-            ctx.deck[destination["slot"]].wells_by_name()[well].load_liquid(
-                liquid=liquid, volume=destination["volume"]
+        liquid = liquid_cache.get(liquid_key)
+        if liquid is None:
+            liquid = ctx.define_liquid(
+                name=destination.name,
+                description=destination.description,
+                display_color=destination.display_color,
             )
+            liquid_cache[liquid_key] = liquid
+        wells = wells_by_slot[destination.slot]
+        for well in destination.wells:
+            wells[well].load_liquid(liquid=liquid, volume=destination.volume)
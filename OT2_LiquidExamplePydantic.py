@@ -1,6 +1,5 @@
-from dataclasses import dataclass
 from pydantic import BaseModel, validator, ValidationError
-from typing import List, Set
+from typing import Dict, List, Sequence, Set, Tuple
 from opentrons import protocol_api
 import pprint
 
@@ -13,6 +12,19 @@ requirements = {
     "apiLevel": "2.20",
 }
 
+# The headers the liquids CSV must have.
+EXPECTED_HEADERS = frozenset(
+    {
+        "labware_load_name",
+        "slot",
+        "wells",
+        "name",
+        "description",
+        "display_color",
+        "volume",
+    }
+)
+
 
 # Pydantic bundled in the App/Robot is version 1.10.17 as of 8/9/2024
 class LiquidDestination(BaseModel):
@@ -24,6 +36,10 @@ class LiquidDestination(BaseModel):
     display_color: str
     volume: float
 
+    class Config:
+        # a destination is never changed once it is parsed from the CSV
+        allow_mutation = False
+
     @validator("volume")
     def volume_value(cls, value):
         if value is None:
@@ -46,14 +62,13 @@ class LiquidDestination(BaseModel):
     def no_empty_strings(cls, value):
         if not value:
             raise ValueError("Field cannot be None")
-        if value.strip() == "":
+        if value.isspace():
             raise ValueError("Field cannot be empty string")
         return value
 
     @property
     def key(self) -> str:
-        if not self.labware_load_name or not self.slot:
-            raise ValueError("Labware name and slot must be defined")
+        # no_empty_strings has already rejected an empty labware name or slot
         return f"{self.labware_load_name}_{self.slot}"
 
 
@@ -63,29 +78,28 @@ class LiquidDestinations:
     def __init__(self, ctx) -> None:
         self.ctx = ctx
         self.destinations: List[LiquidDestination] = []
+        # the wells already defined in each labware, keyed by LiquidDestination.key
+        self.wells_by_key: Dict[str, Set[str]] = {}
 
     def add_destination(self, destination: LiquidDestination) -> None:
-        # has this destination already been added?
-        liquids_in_same_slot = [
-            d for d in self.destinations if d.key == destination.key
-        ]
-
         # Check for overlapping wells with previously added destinations
-        if liquids_in_same_slot:
-            for liquid in liquids_in_same_slot:
-                overlapping_wells = liquid.wells.intersection(destination.wells)
-                if overlapping_wells:
-                    raise ValueError(
-                        f"Wells {overlapping_wells} in labware {destination.labware_load_name} at slot {destination.slot} have already been defined."
-                    )
+        # in the same labware, without scanning every destination added so far
+        defined_wells = self.wells_by_key.setdefault(destination.key, set())
+        overlapping_wells = defined_wells.intersection(destination.wells)
+        if overlapping_wells:
+            raise ValueError(
+                f"Wells {overlapping_wells} in labware {destination.labware_load_name} at slot {destination.slot} have already been defined."
+            )
+        defined_wells.update(destination.wells)
         # Add the destination
         self.destinations.append(destination)
 
     def get_destinations(self) -> List[LiquidDestination]:
         return self.destinations
 
-    def parse_list_of_lists(self, data: List[List[str]]) -> None:
-        if not data or not isinstance(data, list) or len(data) < 2:
+    def parse_list_of_lists(self, data: Sequence[Sequence[str]]) -> None:
+        # parse_as_csv always gives us a list, so the row count is the only check needed
+        if len(data) < 2:
             data_error = (
                 "Data must be a non-empty list of lists with at least two rows."
             )
@@ -93,19 +107,11 @@ class LiquidDestinations:
             raise ValueError(data_error)
 
         headers = data[0]
-        expected_headers = {
-            "labware_load_name",
-            "slot",
-            "wells",
-            "name",
-            "description",
-            "display_color",
-            "volume",
-        }
+        headers_set = set(headers)
 
         # Validate that all expected headers are present
-        unexpected_headers = set(headers) - expected_headers
-        missing_headers = expected_headers - set(headers)
+        unexpected_headers = headers_set - EXPECTED_HEADERS
+        missing_headers = EXPECTED_HEADERS - headers_set
         if unexpected_headers or missing_headers:
             error_message = ""
             if unexpected_headers:
@@ -117,12 +123,29 @@ class LiquidDestinations:
             self.ctx.comment(error_message)
             raise ValueError(error_message)
 
+        header_count = len(headers)
+        # The headers are validated, so find the column of each one once
+        # and read the rows by position rather than building a dict for every row
+        column_index = {header: headers.index(header) for header in EXPECTED_HEADERS}
+
         # Process each row of data
         for index, row in enumerate(data[1:], start=1):
-            row_dict = dict(zip(headers, row))
+            # extra trailing fields are ignored, only short rows are rejected
+            if len(row) < header_count:
+                error = f"Expected {header_count} fields but got {len(row)} in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
+                self.ctx.comment(error)
+                raise ValueError(error)
 
             try:
-                destination = LiquidDestination.parse_obj(row_dict)
+                destination = LiquidDestination(
+                    labware_load_name=row[column_index["labware_load_name"]],
+                    slot=row[column_index["slot"]],
+                    wells=row[column_index["wells"]],
+                    name=row[column_index["name"]],
+                    description=row[column_index["description"]],
+                    display_color=row[column_index["display_color"]],
+                    volume=row[column_index["volume"]],
+                )
                 self.add_destination(destination)
             except ValidationError as e:
                 error = f"Validation error in row {index + 1}: {e.json()}"
@@ -130,24 +153,12 @@ class LiquidDestinations:
                 raise ValueError(error)
 
 
-@dataclass(frozen=True)
-class LabwareSlot:
-    labware: str
-    slot: str
-
-    def __hash__(self):
-        return hash((self.labware, self.slot))
-
-    def __eq__(self, other):
-        if not isinstance(other, LabwareSlot):
-            return NotImplemented
-        return (self.labware, self.slot) == (other.labware, other.slot)
-
-
-def get_unique_labware_slots(liquids: List[LiquidDestination]) -> Set[LabwareSlot]:
+def get_unique_labware_slots(
+    liquids: List[LiquidDestination],
+) -> Set[Tuple[str, str]]:
     unique_labware_slots = set()
     for liquid in liquids:
-        unique_labware_slots.add(LabwareSlot(liquid.labware_load_name, liquid.slot))
+        unique_labware_slots.add((liquid.labware_load_name, liquid.slot))
     return unique_labware_slots
 
 
@@ -157,25 +168,43 @@ def add_parameters(parameters):
         display_name="liquid definitions",
         description="Table of liquids",
     )
+    parameters.add_bool(
+        display_name="Verbose",
+        variable_name="verbose",
+        default=False,
+        description="Comment the parsed CSV data into the run log.",
+    )
 
 
 def run(ctx: protocol_api.ProtocolContext):
 
     # Get the values from the RTPs
     liquids = ctx.params.liquids.parse_as_csv()
-    ctx.comment(pprint.pformat(liquids, indent=4, width=80))
+    # pretty printing the whole CSV is only worth the time when debugging
+    if ctx.params.verbose:
+        ctx.comment(pprint.pformat(liquids, indent=4, width=80))
     liquid_destinations = LiquidDestinations(ctx)
     liquid_destinations.parse_list_of_lists(liquids)
     labwares = get_unique_labware_slots(liquid_destinations.get_destinations())
-    for labware in labwares:
-        ctx.load_labware(labware.labware, labware.slot)
+    wells_by_slot = {}
+    for labware, slot in labwares:
+        wells_by_slot[slot] = ctx.load_labware(labware, slot).wells_by_name()
+    # define each distinct liquid once, even when the CSV places it in several labware
+    liquid_cache = {}
     for destination in liquid_destinations.get_destinations():
-        liquid = ctx.define_liquid(
-            name=destination.name,
-            description=destination.description,
-            display_color=destination.display_color,
+        liquid_key = (
+            destination.name,
+            destination.description,
+            destination.display_color,
         )
-        for well in destination.wells:
-            ctx.deck[destination.slot].wells_by_name()[well].load_liquid(
-                liquid=liquid, volume=destination.volume
+        liquid = liquid_cache.get(liquid_key)
+        if liquid is None:
+            liquid = ctx.define_liquid(
+                name=destination.name,
+                description=destination.description,
+                display_color=destination.display_color,
             )
+            liquid_cache[liquid_key] = liquid
+        wells = wells_by_slot[destination.slot]
+        for well in destination.wells:
+            wells[well].load_liquid(liquid=liquid, volume=destination.volume)
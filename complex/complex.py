@@ -1,3 +1,4 @@
+import sys
 from opentrons import protocol_api
 from dataclasses import dataclass
 from typing import List, Union
@@ -53,7 +54,37 @@ header_mapping = {
 }
 
 
-@dataclass
+def intern_str(value) -> str:
+    """This function converts a value to an interned string.
+    The text columns repeat a handful of values (Yes/No, delay and blowout modes),
+    interning them stores each distinct value once however many rows there are."""
+    return sys.intern(str(value))
+
+
+# How to convert each column of a row, in the same order as HEADERS
+CONVERTERS = (
+    intern_str,  # liq_class
+    float,  # asp_rate
+    float,  # dis_rate
+    intern_str,  # delay_mode
+    float,  # asp_zoffset
+    float,  # dis_zoffset
+    float,  # blowout_zoffset
+    intern_str,  # prewet
+    int,  # prewet_rep
+    intern_str,  # slow_withdrawl_asp
+    intern_str,  # postmix
+    float,  # postmix_vol
+    int,  # postmix_rep
+    intern_str,  # slow_withdrawl_dis
+    intern_str,  # blowout_mode
+    intern_str,  # touch_tip
+    float,  # t_height
+    intern_str,  # air_gap
+)
+
+
+@dataclass(slots=True)
 class LiquidClassConfig:
     liq_class: str
     asp_rate: float
@@ -99,55 +130,35 @@ class LiquidClassConfig:
         )
 
 
-def validate_data_rows(data_rows):
-    """Process each row of data. Fail fast on the first row missing fields or that has empty fields"""
-    for index, row in enumerate(data_rows, start=1):
-        if len(row) != len(HEADERS):
-            error = f"There are missing fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
-            raise ValueError(error)
-
-        for value in row:
-            if value is None or value.strip() == "":
-                error = f"There are empty fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
-                raise ValueError(error)
-
-
 def read_liquid_class_config_from_list(
     data: List[List[Union[str, int, float]]]
 ) -> List[LiquidClassConfig]:
-    """This function reads a list of lists and returns a list of LiquidClassConfig objects"""
+    """This function reads a list of lists and returns a list of LiquidClassConfig objects.
+    Each row is validated as it is read, so the rows are only walked once."""
 
     # The first row of our data is the headers
     headers = data[0]
     assert headers == HEADERS, f"Expected headers: {HEADERS}, but got: {headers}"
 
+    # Iterate over the rest of the rows, validate them and create LiquidClassConfig objects
+    liquid_class_configs = []
+    header_count = len(HEADERS)
+
     # Ignore the first row, as it is the headers
-    data_rows = data[1:]
+    for index, row in enumerate(data[1:], start=1):
+        # Fail fast on the first row missing fields or that has empty fields
+        if len(row) != header_count:
+            error = f"There are missing fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
+            raise ValueError(error)
 
-    validate_data_rows(data_rows)
-    # Iterate over the rest of the rows and create LiquidClassConfig objects
-    liquid_class_configs = []
+        if any(not value or value.isspace() for value in row):
+            error = f"There are empty fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
+            raise ValueError(error)
 
-    for row in data_rows:
+        # Each value is converted by the matching entry of CONVERTERS
+        # and passed positionally, in the order of the LiquidClassConfig fields
         liquid_class_config = LiquidClassConfig(
-            liq_class=str(row[0]),
-            asp_rate=float(row[1]),
-            dis_rate=float(row[2]),
-            delay_mode=str(row[3]),
-            asp_zoffset=float(row[4]),
-            dis_zoffset=float(row[5]),
-            blowout_zoffset=float(row[6]),
-            prewet=str(row[7]),
-            prewet_rep=int(row[8]),
-            slow_withdrawl_asp=str(row[9]),
-            postmix=str(row[10]),
-            postmix_vol=float(row[11]),
-            postmix_rep=int(row[12]),
-            slow_withdrawl_dis=str(row[13]),
-            blowout_mode=str(row[14]),
-            touch_tip=str(row[15]),
-            t_height=float(row[16]),
-            air_gap=str(row[17]),
+            *[convert(value) for convert, value in zip(CONVERTERS, row)]
         )
         liquid_class_configs.append(liquid_class_config)
 
@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
-from typing import Dict, List
+from itertools import chain, product
+from typing import ClassVar, Dict, List, Tuple
 
 
 metadata = {"name": "complex", "author": "Josh McVey", "description": ""}
@@ -9,7 +10,7 @@ requirements = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Well:
     row: str
     column: int
@@ -41,27 +42,34 @@ class Plate:
     # plate.wells["A1"] will return the well in the top left corner of the plate
     wells: Dict[str, Well] = field(default_factory=dict)
 
+    ROWS: ClassVar[List[str]] = list("ABCDEFGH")
+    COLUMNS: ClassVar[List[int]] = [
+        1,
+        2,
+        3,
+        4,
+        5,
+        6,
+        7,
+        8,
+        9,
+        10,
+        11,
+        12,
+    ]  # more clear than list(range(1, 13))
+    # (well id, row, column) of every well, A1, A2, ..., H12
+    # in the order we read the CSV cells, left to right then top to bottom
+    # built once for the class rather than formatting the well ids for every plate
+    WELL_TEMPLATE: ClassVar[Tuple[Tuple[str, str, int], ...]] = tuple(
+        (f"{row}{col}", row, col) for row, col in product(ROWS, COLUMNS)
+    )
+    WELL_IDS: ClassVar[List[str]] = [well_id for well_id, _, _ in WELL_TEMPLATE]
+
     def __post_init__(self):
-        # Initialize all wells in a 96 well plate
-        self.ROWS: List[str] = list("ABCDEFGH")
-        self.COLUMNS: List[int] = [
-            1,
-            2,
-            3,
-            4,
-            5,
-            6,
-            7,
-            8,
-            9,
-            10,
-            11,
-            12,
-        ]  # more clear than list(range(1, 13))
-        for row in self.ROWS:
-            for col in self.COLUMNS:
-                well_id = f"{row}{col}"
-                self.wells[well_id] = Well(row=row, column=col, volume=0)
+        # Initialize all wells in a 96 well plate from the template
+        self.wells.update(
+            {well_id: Well(row, col, 0) for well_id, row, col in self.WELL_TEMPLATE}
+        )
 
     def get_well(self, well_id: str) -> Well:
         return self.wells[well_id.upper()]
@@ -82,11 +90,9 @@ class Plate:
                 raise ValueError(
                     f"Invalid number of columns in row {i + 1}: expected 12, but got {len(row)}"
                 )
-        rows = "ABCDEFGH"
-        for i, row in enumerate(volumes):
-            for j, volume in enumerate(row):
-                well_id = f"{rows[i]}{j+1}"
-                self.set_well_volume(well_id, volume)
+        # the flattened cells line up with WELL_IDS so we can assign them directly
+        for well_id, volume in zip(self.WELL_IDS, chain.from_iterable(volumes)):
+            self.wells[well_id].volume = volume
 
     def get_row_string(self, row: str) -> str:
         """
@@ -97,7 +103,7 @@ class Plate:
         """
         row = row.upper()
         row_string = ", ".join(
-            [f"{row}{col}={self.wells[f'{row}{col}'].volume}" for col in range(1, 13)]
+            [f"{row}{col}={self.wells[f'{row}{col}'].volume}" for col in self.COLUMNS]
         )
         return row_string
 
@@ -106,14 +112,20 @@ class Plate:
         # ctx.comment() will rip out the /n but testing directly it looks good on the console
         # handles 4 digit int and up to 3 digit float and still looks good
         # 45.8 or 4000
-        plate_str = "Plate Layout:\n"
-        plate_str += "    " + "  ".join([f"{col:>4}" for col in range(1, 13)]) + "\n"
-        plate_str += "  " + "-" * 74 + "\n"
-        for row in "ABCDEFGH":
-            row_str = [f"{self.wells[f'{row}{col}'].volume:>4}" for col in range(1, 13)]
-            plate_str += f"{row} | " + "  ".join(row_str) + "\n"
-
-        return plate_str
+        # collect the lines and join them once rather than growing a string with +=
+        lines = [
+            "Plate Layout:",
+            "    " + "  ".join([f"{col:>4}" for col in self.COLUMNS]),
+            "  " + "-" * 74,
+        ]
+        # WELL_IDS runs row by row, so each row is the next len(COLUMNS) ids
+        row_length = len(self.COLUMNS)
+        for row, start in zip(self.ROWS, range(0, len(self.WELL_IDS), row_length)):
+            well_ids = self.WELL_IDS[start : start + row_length]
+            row_str = [f"{self.wells[well_id].volume:>4}" for well_id in well_ids]
+            lines.append(f"{row} | " + "  ".join(row_str))
+
+        return "\n".join(lines) + "\n"
 
 
 def add_parameters(parameters):
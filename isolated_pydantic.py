@@ -1,23 +1,41 @@
 # This runs just fine against my 8.0.0-alpha.0 bundled python
 # /Applications/Opentrons.app/Contents/Resources/python/bin/python3 isolated_pydantic.py
 # but when I try to analyze the protocol I get an issue with the validator
-from dataclasses import dataclass
+import sys
+from itertools import chain
 from pydantic import BaseModel, validator, ValidationError
-from typing import List, Set
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Set, Tuple
 from opentrons import protocol_api
 import pprint
 
+# The headers the liquids CSV must have.
+EXPECTED_HEADERS = frozenset(
+    {
+        "labware_load_name",
+        "slot",
+        "wells",
+        "name",
+        "description",
+        "display_color",
+        "volume",
+    }
+)
+
 
 # Pydantic bundled in the App/Robot is version 1.10.17 as of 8/9/2024
 class LiquidDestination(BaseModel):
     labware_load_name: str
     slot: str
-    wells: Set[str]
+    wells: FrozenSet[str]
     name: str
     description: str
     display_color: str
     volume: float
 
+    class Config:
+        # a destination is never changed once it is parsed, frozen also makes it hashable
+        frozen = True
+
     @validator("volume")
     def volume_value(cls, value):
         if value is None:
@@ -33,21 +51,21 @@ class LiquidDestination(BaseModel):
         if not value:
             raise ValueError("Wells cannot be None")
         if isinstance(value, str):
-            return set(value.split(";"))
+            # the same few well names repeat across rows, interning them lets every row share one string
+            return frozenset(sys.intern(well) for well in value.split(";"))
         return value
 
     @validator("labware_load_name", "slot", "name", "description", "display_color")
     def no_empty_strings(cls, value):
         if not value:
             raise ValueError("Field cannot be None")
-        if value.strip() == "":
+        if value.isspace():
             raise ValueError("Field cannot be empty string")
         return value
 
     @property
     def key(self) -> str:
-        if not self.labware_load_name or not self.slot:
-            raise ValueError("Labware name and slot must be defined")
+        # no_empty_strings has already rejected an empty labware name or slot
         return f"{self.labware_load_name}_{self.slot}"
 
 
@@ -122,21 +140,19 @@ class LiquidDestinations:
 
     def __init__(self) -> None:
         self.destinations: List[LiquidDestination] = []
+        # the wells already defined in each labware, keyed by LiquidDestination.key
+        self.wells_by_key: Dict[str, Set[str]] = {}
 
     def add_destination(self, destination: LiquidDestination) -> None:
-        # has this destination already been added?
-        liquids_in_same_slot = [
-            d for d in self.destinations if d.key == destination.key
-        ]
-
         # Check for overlapping wells with previously added destinations
-        if liquids_in_same_slot:
-            for liquid in liquids_in_same_slot:
-                overlapping_wells = liquid.wells.intersection(destination.wells)
-                if overlapping_wells:
-                    raise ValueError(
-                        f"Wells {overlapping_wells} in labware {destination.labware_load_name} at slot {destination.slot} have already been defined."
-                    )
+        # in the same labware, without scanning every destination added so far
+        defined_wells = self.wells_by_key.setdefault(destination.key, set())
+        overlapping_wells = defined_wells.intersection(destination.wells)
+        if overlapping_wells:
+            raise ValueError(
+                f"Wells {overlapping_wells} in labware {destination.labware_load_name} at slot {destination.slot} have already been defined."
+            )
+        defined_wells.update(destination.wells)
         # Add the destination
         self.destinations.append(destination)
 
@@ -144,26 +160,24 @@ class LiquidDestinations:
         return self.destinations
 
     def parse_list_of_lists(self, data: List[List[str]]) -> None:
-        if not data or not isinstance(data, list) or len(data) < 2:
+        self.parse_rows(data)
+
+    def parse_rows(self, rows: Iterable[Sequence[str]]) -> None:
+        # Rows are consumed one at a time, so a csv.reader can be passed straight in
+        # without first reading the whole file into a list
+        rows = iter(rows)
+        headers = next(rows, None)
+        first_row = next(rows, None)
+        if headers is None or first_row is None:
             data_error = (
                 "Data must be a non-empty list of lists with at least two rows."
             )
             raise ValueError(data_error)
-
-        headers = data[0]
-        expected_headers = {
-            "labware_load_name",
-            "slot",
-            "wells",
-            "name",
-            "description",
-            "display_color",
-            "volume",
-        }
+        headers_set = set(headers)
 
         # Validate that all expected headers are present
-        unexpected_headers = set(headers) - expected_headers
-        missing_headers = expected_headers - set(headers)
+        unexpected_headers = headers_set - EXPECTED_HEADERS
+        missing_headers = EXPECTED_HEADERS - headers_set
         if unexpected_headers or missing_headers:
             error_message = ""
             if unexpected_headers:
@@ -174,36 +188,40 @@ class LiquidDestinations:
                 error_message += f"Missing headers: {', '.join(missing_headers)}."
             raise ValueError(error_message)
 
+        header_count = len(headers)
+        # The headers are validated, so find the column of each one once
+        # and read the rows by position rather than building a dict for every row
+        column_index = {header: headers.index(header) for header in EXPECTED_HEADERS}
+
         # Process each row of data
-        for index, row in enumerate(data[1:], start=1):
-            row_dict = dict(zip(headers, row))
+        for index, row in enumerate(chain([first_row], rows), start=1):
+            # extra trailing fields are ignored, only short rows are rejected
+            if len(row) < header_count:
+                error = f"Expected {header_count} fields but got {len(row)} in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
+                raise ValueError(error)
 
             try:
-                destination = LiquidDestination.parse_obj(row_dict)
+                destination = LiquidDestination(
+                    labware_load_name=row[column_index["labware_load_name"]],
+                    slot=row[column_index["slot"]],
+                    wells=row[column_index["wells"]],
+                    name=row[column_index["name"]],
+                    description=row[column_index["description"]],
+                    display_color=row[column_index["display_color"]],
+                    volume=row[column_index["volume"]],
+                )
                 self.add_destination(destination)
             except ValidationError as e:
                 error = f"Validation error in row {index + 1}: {e.json()}"
                 raise ValueError(error)
 
 
-@dataclass(frozen=True)
-class LabwareSlot:
-    labware: str
-    slot: str
-
-    def __hash__(self):
-        return hash((self.labware, self.slot))
-
-    def __eq__(self, other):
-        if not isinstance(other, LabwareSlot):
-            return NotImplemented
-        return (self.labware, self.slot) == (other.labware, other.slot)
-
-
-def get_unique_labware_slots(liquids: List[LiquidDestination]) -> Set[LabwareSlot]:
+def get_unique_labware_slots(
+    liquids: List[LiquidDestination],
+) -> Set[Tuple[str, str]]:
     unique_labware_slots = set()
     for liquid in liquids:
-        unique_labware_slots.add(LabwareSlot(liquid.labware_load_name, liquid.slot))
+        unique_labware_slots.add((liquid.labware_load_name, liquid.slot))
     return unique_labware_slots
 
 
@@ -77,13 +77,12 @@ def validate_data_rows(data_rows):
             error = f"There are missing fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
             raise ValueError(error)
 
-        for value in row:
-            if value is None or value.strip() == "":
-                error = f"There are empty fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
-                raise ValueError(error)
+        if any(not value or value.isspace() for value in row):
+            error = f"There are empty fields in data row: {index}, line {index+1} of the CSV. The row data is: {row}"
+            raise ValueError(error)
 
 
-@dataclass
+@dataclass(slots=True)
 class Transfer:
     """This class describes 1 row of CSV data.
     Using a dataclass allows us to use named attributes to access the data.
@@ -99,18 +98,11 @@ class Transfer:
     volume_ul: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LabwareSlot:
     """This class defines labware slots so that we can use python's set."
-    This makes it easier to ensure we only load each labware once."""
+    This makes it easier to ensure we only load each labware once.
+    frozen=True generates __hash__ and __eq__ from the fields for us."""
 
     labware: str
     slot: str
-
-    def __hash__(self):
-        return hash((self.labware, self.slot))
-
-    def __eq__(self, other):
-        if not isinstance(other, LabwareSlot):
-            return NotImplemented
-        return (self.labware, self.slot) == (other.labware, other.slot)
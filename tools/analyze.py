@@ -61,8 +61,8 @@ def execute_analyze_command():
     print("\n Running command...\n")
 
     # Execute the command
-    result = subprocess.check_output(command)
-    print(result.decode())
+    # the analyzer writes straight to our console as it runs instead of being buffered and printed at the end
+    subprocess.run(command, check=True)
 
 
 if __name__ == "__main__":
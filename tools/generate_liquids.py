@@ -1,6 +1,7 @@
 import csv
 import random
-from typing import List, Set
+import sys
+from typing import Dict, Iterable, Iterator, List, Set
 from dataclasses import dataclass
 
 
@@ -113,20 +114,29 @@ class ColorPalette:
             "#6A3A4C",
         }
         self.used_colors: Set[str] = set()
+        # Shuffle the palette once and hand out colors in that order
+        # so each draw is an index step instead of rebuilding the available colors
+        # sorted() first so the shuffle only depends on the random seed, not set ordering
+        self.shuffled_colors: List[str] = random.sample(
+            sorted(self.colors), len(self.colors)
+        )
+        self.next_color_index = 0
 
     def use_random_color(self) -> str:
-        available_colors = self.colors - self.used_colors
-        if not available_colors:
+        if self.next_color_index >= len(self.shuffled_colors):
             raise Exception("No more available colors.")
-        color = random.choice(list(available_colors))
+        color = self.shuffled_colors[self.next_color_index]
+        self.next_color_index += 1
         self.used_colors.add(color)
         return color
 
     def reset_used_colors(self) -> None:
         self.used_colors.clear()
+        random.shuffle(self.shuffled_colors)
+        self.next_color_index = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class LiquidDestination:
     labware_load_name: str
     slot: str
@@ -144,22 +154,20 @@ class LiquidDestination:
 class LiquidDestinations:
     def __init__(self) -> None:
         self.destinations: List[LiquidDestination] = []
+        # the wells already defined in each labware, keyed by LiquidDestination.key
+        self.wells_by_key: Dict[str, Set[str]] = {}
 
     def add_destination(self, destination: LiquidDestination) -> None:
 
-        # has this destination already been added?
-        liquids_in_same_slot = [
-            d for d in self.destinations if d.key == destination.key
-        ]
-
         # Check for overlapping wells with previously added destinations
-        if liquids_in_same_slot:
-            for liquid in liquids_in_same_slot:
-                overlapping_wells = liquid.wells.intersection(destination.wells)
-                if overlapping_wells:
-                    raise ValueError(
-                        f"Wells {overlapping_wells} in labware {destination.labware_load_name} at slot {destination.slot} have already been defined."
-                    )
+        # in the same labware, without scanning every destination added so far
+        defined_wells = self.wells_by_key.setdefault(destination.key, set())
+        overlapping_wells = defined_wells.intersection(destination.wells)
+        if overlapping_wells:
+            raise ValueError(
+                f"Wells {overlapping_wells} in labware {destination.labware_load_name} at slot {destination.slot} have already been defined."
+            )
+        defined_wells.update(destination.wells)
         # Add the destination
         self.destinations.append(destination)
 
@@ -169,7 +177,9 @@ class LiquidDestinations:
     def parse_list_of_lists(
         self, data: List[List[str]], well_delimiter: str = ";"
     ) -> None:
-        headers = data[0]
+        # intern the header names so every row dict shares the same key strings
+        # and lookups by field name match them by identity
+        headers = [sys.intern(header) for header in data[0]]
         for row in data[1:]:
             row_dict = dict(zip(headers, row))
             wells = set(row_dict["wells"].split(well_delimiter))
@@ -185,80 +195,14 @@ class LiquidDestinations:
             self.add_destination(destination)
 
 
-# https://colorhunt.co/palette/17153b2e236c433d8bc8acd6
-pallet = ["17153B", "2E236C", "433D8B", "C8ACD6"]
-emoji = "🪄✨➡️🥳⬅️😭🤣😂😊❓▶️😝❤️😍😒👌😘💕"
-
 color_palette = ColorPalette()
-example_data = [
-    [
-        "labware_load_name",
-        "slot",
-        "name",
-        "description",
-        "display_color",
-        "volume",
-        "wells",
-    ],
-    [
-        "nest_96_wellplate_100ul_pcr_full_skirt",
-        "1",
-        "H₂O",
-        "Water, 100 µL",
-        color_palette.use_random_color(),
-        "100.0",
-        "A1;B1;C1",
-    ],
-    [
-        "nest_96_wellplate_100ul_pcr_full_skirt",
-        "1",
-        "1 M NaCl",
-        "Sodium Chloride, 1 M",
-        color_palette.use_random_color(),
-        "100",
-        "A3;B3;C3",
-    ],
-    [
-        "nest_96_wellplate_100ul_pcr_full_skirt",
-        "1",
-        "EtOH",
-        "Ethanol, 70%",
-        color_palette.use_random_color(),
-        "100.0",
-        "F1;G1",
-    ],
-    [
-        "nest_96_wellplate_100ul_pcr_full_skirt",
-        "1",
-        "Tris-HCl",
-        "Tris Hydrochloride, 1 M",
-        color_palette.use_random_color(),
-        "50.0",
-        "A10;A11",
-    ],
-    [
-        "nest_96_wellplate_100ul_pcr_full_skirt",
-        "1",
-        "PBS",
-        "Phosphate Buffered Saline, 1X",
-        color_palette.use_random_color(),
-        "100.0",
-        "B10;B11",
-    ],
-    [
-        "nest_96_wellplate_100ul_pcr_full_skirt",
-        "1",
-        "BSA",
-        "Bovine Serum Albumin, 1 mg/mL",
-        color_palette.use_random_color(),
-        "100.0",
-        "C10;C11",
-    ],
-]
 
 
-def generate_96_rows() -> List[List[str]]:
-    data = [
+def make_example_data() -> List[List[str]]:
+    # built when asked for rather than at import, so importing this module doesn't draw colors
+    # start from a full palette so repeated calls don't run it down
+    color_palette.reset_used_colors()
+    return [
         [
             "labware_load_name",
             "slot",
@@ -267,7 +211,74 @@ def generate_96_rows() -> List[List[str]]:
             "display_color",
             "volume",
             "wells",
-        ]
+        ],
+        [
+            "nest_96_wellplate_100ul_pcr_full_skirt",
+            "1",
+            "H₂O",
+            "Water, 100 µL",
+            color_palette.use_random_color(),
+            "100.0",
+            "A1;B1;C1",
+        ],
+        [
+            "nest_96_wellplate_100ul_pcr_full_skirt",
+            "1",
+            "1 M NaCl",
+            "Sodium Chloride, 1 M",
+            color_palette.use_random_color(),
+            "100",
+            "A3;B3;C3",
+        ],
+        [
+            "nest_96_wellplate_100ul_pcr_full_skirt",
+            "1",
+            "EtOH",
+            "Ethanol, 70%",
+            color_palette.use_random_color(),
+            "100.0",
+            "F1;G1",
+        ],
+        [
+            "nest_96_wellplate_100ul_pcr_full_skirt",
+            "1",
+            "Tris-HCl",
+            "Tris Hydrochloride, 1 M",
+            color_palette.use_random_color(),
+            "50.0",
+            "A10;A11",
+        ],
+        [
+            "nest_96_wellplate_100ul_pcr_full_skirt",
+            "1",
+            "PBS",
+            "Phosphate Buffered Saline, 1X",
+            color_palette.use_random_color(),
+            "100.0",
+            "B10;B11",
+        ],
+        [
+            "nest_96_wellplate_100ul_pcr_full_skirt",
+            "1",
+            "BSA",
+            "Bovine Serum Albumin, 1 mg/mL",
+            color_palette.use_random_color(),
+            "100.0",
+            "C10;C11",
+        ],
+    ]
+
+
+def generate_96_rows() -> Iterator[List[str]]:
+    # yield the rows one at a time so the csv writer can write them as they are made
+    yield [
+        "labware_load_name",
+        "slot",
+        "name",
+        "description",
+        "display_color",
+        "volume",
+        "wells",
     ]
     rows, columns = 8, 12
     # chr(65 + r): Converts row index to corresponding letter (A-H) using ASCII values.
@@ -290,19 +301,17 @@ def generate_96_rows() -> List[List[str]]:
             volume,
             wells,
         ]
-        data.append(row)
-
-    return data
+        yield row
 
 
-def generate_csv(data: List[List[str]], filename: str) -> None:
+def generate_csv(data: Iterable[List[str]], filename: str) -> None:
     with open(filename, mode="w", newline="\n", encoding="utf-8") as file:
         writer = csv.writer(file)
         writer.writerows(data)
 
 
 def main():
-    generate_csv(example_data, "example_liquids.csv")
+    generate_csv(make_example_data(), "example_liquids.csv")
     generate_csv(generate_96_rows(), "96_wellplate_liquids.csv")
 
 
@@ -1,4 +1,6 @@
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
 import sys
 import csv
@@ -42,6 +44,8 @@ if not PROTOCOL_FILE_PATH.exists():
     raise FileNotFoundError(f"Protocol file is missing: {PROTOCOL_FILE_PATH}")
 
 
+# The platform cannot change while we run, so look the path up once
+@lru_cache(maxsize=None)
 def opentrons_app_python_executable_path() -> Path:
     """Return the appropriate Python executable path for Opentrons app."""
     if sys.platform == "win32":
@@ -74,30 +78,29 @@ def get_csv_rtp_data() -> Optional[Path]:
 
     with open(CSV_RTP_DATA_PATH, "r") as f:
         reader = csv.reader(f)
-        rows = list(reader)
+        header = next(reader, None)
 
         # Display CSV headers and rows
-        if rows:
+        if header is not None:
             print(f"✅ Using CSV RTP data override from {CSV_RTP_DATA_PATH}")
-            header, *data_rows = rows
-            max_widths = [
-                max(len(str(item)) for item in column) for column in zip(*rows)
-            ]
-
-            # Print headers with pretty formatting
-            header_row = " | ".join(
-                f"{col:<{max_widths[i]}}" for i, col in enumerate(header)
-            )
-            print(header_row)
-            print("-" * len(header_row))
-
-            # Print each row with matching column widths
-            for row in data_rows:
-                print(
-                    " | ".join(
-                        f"{str(col):<{max_widths[i]}}" for i, col in enumerate(row)
-                    )
-                )
+            # Widen the columns as we read each row
+            # rather than transposing all the rows afterwards to measure them
+            max_widths = [len(col) for col in header]
+            data_rows = []
+            for row in reader:
+                for i, col in enumerate(row):
+                    if len(col) > max_widths[i]:
+                        max_widths[i] = len(col)
+                data_rows.append(row)
+
+            # Build the column layout once per CSV instead of per cell
+            row_format = " | ".join(f"{{:<{width}}}" for width in max_widths)
+
+            # Collect the headers and rows and write them out in one go
+            header_row = row_format.format(*header)
+            lines = [header_row, "-" * len(header_row)]
+            lines.extend(row_format.format(*row) for row in data_rows)
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("CSV file is empty.")
 
@@ -115,7 +118,13 @@ def get_labware_paths() -> Optional[List[Path]]:
 
     print(f"✅ Using labware library from {LABWARE_LIBRARY_PATH}")
     # Find all .json files in the directory and return as a list
-    json_files = list(LABWARE_LIBRARY_PATH.glob("*.json"))
+    # scandir entries already know their name and type, so no per-file stat or fnmatch
+    with os.scandir(LABWARE_LIBRARY_PATH) as entries:
+        json_files = [
+            Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(".json") and entry.is_file()
+        ]
 
     # Check if no JSON files were found
     if not json_files: